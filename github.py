@@ -2,9 +2,6 @@ import json
 import requests
 import datetime
 from typing import List,Dict
-import pandas as pd
-
-pd.Series(dtype='float64')
 
 class Github:
     def __init__(self,token: str, org: str) -> None:
@@ -79,7 +76,10 @@ class Github:
     def paginate(self, d: requests.models.Response ) -> Dict:
         '''
         Github's API uses the links for replies with multiple pages.
+        Raises requests.HTTPError for an error reply (rate limit, 403, 5xx) rather than
+        returning the error body as if it were a page of results.
         '''
+        d.raise_for_status()
         resp = {'pages': 0, 'data' : []}
         next_page = None
         next_page = d.links.get('next')
@@ -97,6 +97,7 @@ class Github:
         # Iterate over the linked pagination
         while next_page is not None: 
             req = self.s.get(next_page.get('url')) 
+            req.raise_for_status()
             resp['data'].append(req.json()) 
             next_page = req.links.get('next') 
             resp['pages'] += 1 
@@ -0,0 +1,125 @@
+import datetime
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+class JournalError(Exception):
+    '''
+    raised when a journal can't be used for this run: it already exists, was written
+    with other run arguments, or is corrupt
+    '''
+
+class Journal:
+    def __init__(self, path: Optional[str], run_args: Dict, resume: bool = False,
+                 batch_size: int = 50, flush_interval: float = 30) -> None:
+        '''
+        Append-only JSON lines file recording each completed unit of work
+        (a repo's PR listing, a PR's commit fetch) so an interrupted run can be resumed.
+        The first line is a header with the run arguments the recorded units depend on
+        and the time the run started, which a resumed run reuses as its reference time.
+        With path=None journaling is disabled and every unit is redone.
+        '''
+        self.path = path
+        self.run_args = run_args
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.units = {}
+        self.pending = []
+        self.last_flush = time.monotonic()
+        self.started_at = datetime.datetime.now()
+        self.resumed = False
+
+        if self.path is None:
+            return
+
+        exists = os.path.exists(self.path) and os.path.getsize(self.path) > 0
+        if resume and exists:
+            self.units = self.load()
+        elif exists:
+            raise JournalError(
+                f"journal {self.path} already exists. Pass --resume to continue it, or delete it to start over"
+            )
+
+        if not self.resumed:
+            with open(self.path, 'w') as f:
+                f.write(json.dumps({'header': self.run_args, 'started_at': self.started_at.isoformat()}) + '\n')
+
+    def load(self) -> Dict:
+        '''
+        reads the completed units from the journal. A partially written last line
+        (the run died mid-write) is cut off so new entries start on a clean line,
+        that unit is simply redone. If not even the header made it to disk the journal
+        is treated as fresh.
+        '''
+        with open(self.path, 'rb') as f:
+            data = f.read()
+
+        end = data.rfind(b'\n') + 1
+        if end != len(data):
+            with open(self.path, 'r+b') as f:
+                f.truncate(end)
+            data = data[:end]
+
+        try:
+            lines = data.decode().splitlines()
+            if not lines:
+                return {}
+            header = json.loads(lines[0])
+            run_args = header['header']
+            started_at = datetime.datetime.fromisoformat(header['started_at'])
+            units = {}
+            for line in lines[1:]:
+                entry = json.loads(line)
+                units[entry['key']] = entry['value']
+        except (ValueError, KeyError, TypeError) as e:
+            raise JournalError(
+                f"journal {self.path} is corrupt ({e}). Delete it or use another --journal to start over"
+            )
+
+        if run_args != self.run_args:
+            raise JournalError(
+                f"journal {self.path} was written with {run_args}, not {self.run_args}. "
+                "Delete it or use another --journal to start over"
+            )
+
+        self.started_at = started_at
+        self.resumed = True
+        return units
+
+    def get(self, key: str) -> Optional[List]:
+        '''
+        returns the recorded value of a completed unit, or None if it still has to be done
+        '''
+        return self.units.get(key)
+
+    def record(self, key: str, value: List) -> None:
+        '''
+        marks a unit as completed. Entries are buffered and written once batch_size
+        of them are pending or flush_interval seconds have passed since the last write
+        '''
+        if self.path is None:
+            return
+        self.units[key] = value
+        self.pending.append(json.dumps({'key': key, 'value': value}))
+        if len(self.pending) >= self.batch_size or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self.last_flush = time.monotonic()
+        if not self.pending:
+            return
+        with open(self.path, 'a') as f:
+            f.write('\n'.join(self.pending) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        # persist the buffer when the run ends, including on a Python exception.
+        # A hard kill (SIGKILL, OOM, CI timeout) still loses whatever is unflushed.
+        if self.path is not None:
+            self.flush()
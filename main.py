@@ -1,11 +1,14 @@
 import argparse
 import sys 
 import os 
-import pandas as pd
 import datetime
 import re
+import statistics
 from typing import List,Dict
 from github import Github
+from journal import Journal, JournalError
+
+DEFAULT_JOURNAL = '.lead_time_journal.jsonl'
 
 def convert_time(ts):
     '''
@@ -33,6 +36,22 @@ def parse_result_method(r):
     else:
         return ['mean']
 
+def calc_lead_time(seconds: List, result_method: List) -> datetime.timedelta:
+    '''
+    Reduces the commit deltas (in seconds) to a single lead time using the stdlib only, so the
+    CLI does not have to pay for the pandas/numpy import on every run.
+    Percentiles use linear interpolation, matching pandas' Series.quantile default.
+    '''
+    if result_method[0] == 'percentile':
+        seconds = sorted(seconds)
+        pos = (len(seconds) - 1) * result_method[1]
+        lower = int(pos)
+        upper = min(lower + 1, len(seconds) - 1)
+        value = seconds[lower] + (seconds[upper] - seconds[lower]) * (pos - lower)
+    else:
+        value = statistics.fmean(seconds)
+    return datetime.timedelta(seconds=value)
+
 def main(args):
     # define args from the CLI 
     org = args.org
@@ -44,6 +63,22 @@ def main(args):
     verbose = args.verbose
     result_method = parse_result_method(args.resultMethod)
 
+    # Journaling is opt-in, --resume on its own uses the default journal file
+    journal_path = args.journal
+    if args.resume and not journal_path:
+        journal_path = DEFAULT_JOURNAL
+    # The recorded units are only valid for the same org and PR filters
+    run_args = {
+        'org' : org,
+        'targetBranch' : target_branch,
+        'refString' : ref_string,
+        'maxDays' : max_days
+    }
+    try:
+        journal = Journal(journal_path, run_args, resume=args.resume)
+    except JournalError as e:
+        sys.exit(f"error: {e}")
+
     base_url = 'https://api.github.com'
     token = os.environ['GITHUB_ACCESS_TOKEN']
 
@@ -60,64 +95,86 @@ def main(args):
         excluded_repos = []
     
     results = []
-    now = datetime.datetime.now()
-    for repo in repos: 
-        if verbose:
-            print(f"repo: {repo}")
-
-        if repo not in excluded_repos:
-            params = {'state' : "closed", 'per_page': 100, 'base': target_branch }
-            prs = g.get_pr_list(repo, params)
-            times = []
-            included_releases = []
-            
-            for pr_list in prs['data']: 
-                
-                for pr in pr_list:
-                    created_at = convert_time(pr.get("created_at"))
-                    merged_at = convert_time(pr.get("merged_at"))
-                    closed_at = convert_time(pr.get("closed_at"))
-                    # Ignore PRs that are not merged
-                    if merged_at:
-                        days =  now - created_at # check when the PR was created
-                        # only continue if the PR was created less than max_days days ago 
+    # A resumed run keeps the original run's reference time so every repo is filtered on the same window
+    now = journal.started_at
+    if journal.resumed:
+        print(f"resuming run started at {now}")
+    with journal:
+        for repo in repos: 
+            if verbose:
+                print(f"repo: {repo}")
+
+            if repo not in excluded_repos:
+                # Work unit 1: the list of merged release PRs for the repo
+                key = f"prs/{repo}"
+                releases = journal.get(key)
+                if releases is None:
+                    params = {'state' : "closed", 'per_page': 100, 'base': target_branch }
+                    prs = g.get_pr_list(repo, params)
+                    releases = []
+
+                    for pr_list in prs['data']: 
                         
-                        if days.days <= max_days:
-                            h = pr.get('head')
-                            # Search for PRs where 'release' is in the reference field
-                            # TODO change to regex 
-                            
-                            if ref_string in h.get('ref').lower():  
-                                included_releases.append(h.get('ref').lower())
-                                params = {}
+                        for pr in pr_list:
+                            created_at = convert_time(pr.get("created_at"))
+                            merged_at = convert_time(pr.get("merged_at"))
+                            # Ignore PRs that are not merged
+                            if merged_at:
+                                days =  now - created_at # check when the PR was created
+                                # only continue if the PR was created less than max_days days ago 
+                                
+                                if days.days <= max_days:
+                                    h = pr.get('head')
+                                    # Search for PRs where 'release' is in the reference field
+                                    # TODO change to regex 
+                                    
+                                    if ref_string in h.get('ref').lower():  
+                                        releases.append({
+                                            'number' : pr.get('number'),
+                                            'ref' : h.get('ref').lower(),
+                                            'merged_at' : pr.get('merged_at')
+                                        })
+                    journal.record(key, releases)
+
+                times = []
+                included_releases = []
+                for release in releases:
+                    included_releases.append(release['ref'])
+                    if verbose:
+                        print(f"-release: {release['ref']}")
+
+                    # Work unit 2: the commit deltas of a single release PR
+                    key = f"commits/{repo}/{release['number']}"
+                    deltas = journal.get(key)
+                    if deltas is None:
+                        merged_at = convert_time(release['merged_at'])
+                        params = {}
+                        deltas = []
+
+                        #Get all of the commits 
+                        c = g.get_commit_list(repo, release['number'], params )
+
+                        for commit in c['data'][0]:
+                            try:
                                 if verbose:
-                                    print(f"-release: {h.get('ref').lower()}")
+                                    print(f"--commit: {commit.get('commit').get('author').get('name')} {commit.get('commit').get('author').get('date')} { commit.get('commit').get('message')[:40] }") 
+                                    #print(f"--author: {commit.get('commit').get('author')}")
+                                # Get the date of the commit 
+                                c = commit.get('commit').get('author').get('date')
+                                c = convert_time(c)
+                                # subtract the PR merge time from the commit creation date. 
+                                deltas.append((merged_at - c).total_seconds())
                                 
-                                #Get all of the commits 
-                                c = g.get_commit_list(repo, pr.get('number'), params )
-
-                                for commit in c['data'][0]:
-                                    try:
-                                        if verbose:
-                                            print(f"--commit: {commit.get('commit').get('author').get('name')} {commit.get('commit').get('author').get('date')} { commit.get('commit').get('message')[:40] }") 
-                                            #print(f"--author: {commit.get('commit').get('author')}")
-                                        # Get the date of the commit 
-                                        c = commit.get('commit').get('author').get('date')
-                                        c = convert_time(c)
-                                        # subtract the PR merge time from the commit creation date. 
-                                        times.append(merged_at - c)
+                            except AttributeError:
+                                #TODO add better error handling. For now skip the PR
+                                pass
+                        journal.record(key, deltas)
+
+                    times.extend(deltas)
                                         
-                                    except AttributeError:
-                                        #TODO add better error handling. For now skip the PR
-                                        pass
-                                    
-            # Skip if no commits added to times list
-            if len(times) != 0:
-                if result_method[0] == 'percentile':
-                    lt = pd.to_timedelta(pd.Series(times)).quantile(result_method[1])
-                else:
-                    lt = pd.to_timedelta(pd.Series(times)).mean()
-                if lt is not pd.NaT: 
+                # Skip if no commits added to times list
+                if len(times) != 0:
+                    lt = calc_lead_time(times, result_method)
                     result = {
                         'repo' : repo,
                         'releases' : included_releases,
@@ -194,6 +251,20 @@ if __name__ == "__main__":
         help="Options are percentile[0-9][0-9] or mean.  Example --rm percentile90  "
     ) 
 
+    parser.add_argument( 
+        '-j', 
+        '--journal',
+        type=str, 
+        required=False,
+        help=f"checkpoint file recording completed work so an interrupted run can be resumed. Off unless set (or --resume, which defaults to {DEFAULT_JOURNAL})"
+    ) 
+
+    parser.add_argument( 
+        '--resume',
+        action='store_true',
+        help="skip the work already recorded in the journal from a previous run"
+    ) 
+
     args = parser.parse_args()
     main(args)
 
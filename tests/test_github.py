@@ -0,0 +1,31 @@
+import json
+
+import pytest
+import requests
+
+from github import Github
+
+def response(status, body, next_url=None):
+    r = requests.Response()
+    r.status_code = status
+    r._content = json.dumps(body).encode()
+    if next_url:
+        r.headers['Link'] = f'<{next_url}>; rel="next"'
+    return r
+
+def test_paginate_returns_pages():
+    g = Github('token', 'org')
+    resp = g.paginate(response(200, [{'number': 1}]))
+    assert resp == {'pages': 1, 'data': [[{'number': 1}]]}
+
+def test_paginate_raises_on_error_reply():
+    g = Github('token', 'org')
+    rate_limited = response(403, {'message': 'API rate limit exceeded', 'documentation_url': 'https://docs.github.com'})
+    with pytest.raises(requests.HTTPError):
+        g.paginate(rate_limited)
+
+def test_paginate_raises_on_error_in_later_page(monkeypatch):
+    g = Github('token', 'org')
+    monkeypatch.setattr(g.s, 'get', lambda url: response(502, {'message': 'Server Error'}))
+    with pytest.raises(requests.HTTPError):
+        g.paginate(response(200, [{'number': 1}], next_url='https://api.github.com/page2'))
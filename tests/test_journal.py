@@ -0,0 +1,120 @@
+import json
+
+import pytest
+
+from journal import Journal, JournalError
+
+RUN_ARGS = {'org': 'o', 'targetBranch': 'main', 'refString': 'release', 'maxDays': 30}
+
+def write_units(path, *keys, resume=False):
+    with Journal(str(path), RUN_ARGS, resume=resume) as j:
+        for key in keys:
+            j.record(key, [key])
+
+def test_fresh_run_writes_header(tmp_path):
+    path = tmp_path / 'j.jsonl'
+    write_units(path, 'a')
+    lines = path.read_text().splitlines()
+    header = json.loads(lines[0])
+    assert header['header'] == RUN_ARGS
+    assert 'started_at' in header
+    assert json.loads(lines[1]) == {'key': 'a', 'value': ['a']}
+
+def test_fresh_run_refuses_existing_journal(tmp_path):
+    path = tmp_path / 'j.jsonl'
+    write_units(path, 'a')
+    with pytest.raises(JournalError):
+        Journal(str(path), RUN_ARGS)
+    # the checkpoint is left untouched
+    assert 'a' in Journal(str(path), RUN_ARGS, resume=True).units
+
+def test_resume_loads_recorded_units(tmp_path):
+    path = tmp_path / 'j.jsonl'
+    write_units(path, 'a', 'b')
+    j = Journal(str(path), RUN_ARGS, resume=True)
+    assert j.get('a') == ['a']
+    assert j.get('b') == ['b']
+    assert j.get('c') is None
+
+def test_resume_with_other_run_args_is_refused(tmp_path):
+    path = tmp_path / 'j.jsonl'
+    write_units(path, 'a')
+    with pytest.raises(JournalError):
+        Journal(str(path), dict(RUN_ARGS, refString='rfc'), resume=True)
+
+def test_resume_tolerates_torn_tail(tmp_path):
+    path = tmp_path / 'j.jsonl'
+    write_units(path, 'a', 'b')
+    with open(path, 'a') as f:
+        f.write('{"key": "c", "val')
+    j = Journal(str(path), RUN_ARGS, resume=True)
+    assert set(j.units) == {'a', 'b'}
+
+def test_append_after_torn_tail_is_readable(tmp_path):
+    path = tmp_path / 'j.jsonl'
+    write_units(path, 'a', 'b')
+    with open(path, 'a') as f:
+        f.write('{"key": "c", "val')
+    write_units(path, 'd', resume=True)
+    j = Journal(str(path), RUN_ARGS, resume=True)
+    assert set(j.units) == {'a', 'b', 'd'}
+
+def test_record_is_batched(tmp_path):
+    path = tmp_path / 'j.jsonl'
+    j = Journal(str(path), RUN_ARGS, batch_size=2, flush_interval=3600)
+    j.record('a', [1])
+    assert len(path.read_text().splitlines()) == 1
+    j.record('b', [2])
+    assert len(path.read_text().splitlines()) == 3
+
+def test_record_flushes_after_interval(tmp_path):
+    path = tmp_path / 'j.jsonl'
+    j = Journal(str(path), RUN_ARGS, batch_size=50, flush_interval=0)
+    j.record('a', [1])
+    assert len(path.read_text().splitlines()) == 2
+
+def test_exit_flushes_on_exception(tmp_path):
+    path = tmp_path / 'j.jsonl'
+    with pytest.raises(RuntimeError):
+        with Journal(str(path), RUN_ARGS) as j:
+            j.record('a', [1])
+            raise RuntimeError('network blip')
+    assert Journal(str(path), RUN_ARGS, resume=True).get('a') == [1]
+
+def test_disabled_journal_writes_nothing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with Journal(None, RUN_ARGS) as j:
+        j.record('a', [1])
+        assert j.get('a') is None
+    assert list(tmp_path.iterdir()) == []
+
+def test_resume_reuses_original_start_time(tmp_path):
+    path = tmp_path / 'j.jsonl'
+    first = Journal(str(path), RUN_ARGS)
+    assert not first.resumed
+    resumed = Journal(str(path), RUN_ARGS, resume=True)
+    assert resumed.resumed
+    assert resumed.started_at == first.started_at
+
+def test_resume_after_torn_header_starts_fresh(tmp_path):
+    path = tmp_path / 'j.jsonl'
+    path.write_text('{"header": {"org"')
+    write_units(path, 'a', resume=True)
+    j = Journal(str(path), RUN_ARGS, resume=True)
+    assert set(j.units) == {'a'}
+
+@pytest.mark.parametrize('line', ['{"key": "b", "val', '{"value": [1]}', '[1, 2]'])
+def test_corrupt_line_is_refused(tmp_path, line):
+    path = tmp_path / 'j.jsonl'
+    write_units(path, 'a', 'c')
+    lines = path.read_text().splitlines()
+    lines.insert(2, line)
+    path.write_text('\n'.join(lines) + '\n')
+    with pytest.raises(JournalError, match='corrupt'):
+        Journal(str(path), RUN_ARGS, resume=True)
+
+def test_header_without_run_args_is_refused(tmp_path):
+    path = tmp_path / 'j.jsonl'
+    path.write_text(json.dumps({'key': 'a', 'value': [1]}) + '\n')
+    with pytest.raises(JournalError, match='corrupt'):
+        Journal(str(path), RUN_ARGS, resume=True)
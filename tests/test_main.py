@@ -0,0 +1,104 @@
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+import requests
+
+import main
+from main import calc_lead_time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def hours(*h):
+    return [x * 3600 for x in h]
+
+def test_import_does_not_load_pandas():
+    '''
+    startup benchmark: `import main` must not pull in pandas/numpy
+    '''
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # -X importtime writes "import time: self | cumulative | module" lines to stderr
+    modules = [line.rsplit('|', 1)[-1].strip() for line in proc.stderr.splitlines() if '|' in line]
+    assert 'main' in modules
+    heavy = [m for m in modules if m.split('.')[0] in ('pandas', 'numpy')]
+    assert heavy == []
+
+def test_mean():
+    assert calc_lead_time(hours(1, 2, 3, 4, 10), ['mean']) == datetime.timedelta(hours=4)
+
+@pytest.mark.parametrize('times, q, expected', [
+    (hours(1, 2, 3, 4, 10), 0, datetime.timedelta(hours=1)),
+    (hours(4, 1, 3, 2), 0.5, datetime.timedelta(hours=2, minutes=30)),
+    (hours(1, 2, 3, 4, 10), 0.99, datetime.timedelta(hours=9.76)),
+])
+def test_percentile(times, q, expected):
+    assert calc_lead_time(times, ['percentile', q]) == expected
+
+@pytest.mark.parametrize('result_method', [['mean'], ['percentile', 0.9]])
+def test_single_element(result_method):
+    assert calc_lead_time(hours(7), result_method) == datetime.timedelta(hours=7)
+
+class FakeGithub:
+    '''
+    one repo with two release PRs, each with a single commit 5h before the merge.
+    Commit fetches for the PR numbers in `failing` raise like a rate-limited reply
+    '''
+    failing = set()
+    commit_calls = []
+
+    def __init__(self, token, org):
+        pass
+
+    def get_pr_list(self, repo, params):
+        now = datetime.datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ')
+        prs = [
+            {'number': n, 'created_at': now, 'merged_at': now, 'head': {'ref': f'release/{n}'}}
+            for n in (1, 2)
+        ]
+        return {'pages': 1, 'data': [prs]}
+
+    def get_commit_list(self, repo, number, params):
+        FakeGithub.commit_calls.append(number)
+        if number in FakeGithub.failing:
+            raise requests.HTTPError('403 Client Error: rate limit exceeded')
+        date = (datetime.datetime.now() - datetime.timedelta(hours=5)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        return {'pages': 1, 'data': [[{'commit': {'author': {'date': date, 'name': 'dev'}, 'message': 'fix'}}]]}
+
+def run_args(journal, resume):
+    return argparse.Namespace(
+        org='org', targetBranch='main', refString='release', excludedRepos=None, maxDays=30,
+        repo='r', verbose=None, resultMethod='mean', journal=journal, resume=resume
+    )
+
+def test_failed_fetch_is_refetched_on_resume(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv('GITHUB_ACCESS_TOKEN', 'token')
+    monkeypatch.setattr(main, 'Github', FakeGithub)
+    journal = str(tmp_path / 'j.jsonl')
+
+    FakeGithub.failing = {2}
+    FakeGithub.commit_calls = []
+    with pytest.raises(requests.HTTPError):
+        main.main(run_args(journal, resume=False))
+    with open(journal) as f:
+        keys = [json.loads(line).get('key') for line in f]
+    assert 'commits/r/1' in keys
+    assert 'commits/r/2' not in keys
+
+    FakeGithub.failing = set()
+    FakeGithub.commit_calls = []
+    capsys.readouterr()
+    main.main(run_args(journal, resume=True))
+    assert FakeGithub.commit_calls == [2]
+    out = capsys.readouterr().out
+    assert 'resuming run started at' in out
+    assert '---repo: r, lead_time 0d 5h' in out